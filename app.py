@@ -1,9 +1,14 @@
+import os
 from flask import Flask, render_template, request, jsonify
 from src.harmonic_balancer import EnhancedHarmonicBalancer
+from src.memoization import BalanceMemo
 import numpy as np
 
 app = Flask(__name__)
 
+# Identical requests share results; set VAPOS_MEMO_PATH to share them across worker processes
+memo = BalanceMemo(max_entries=256, ttl=3600, path=os.environ.get('VAPOS_MEMO_PATH'))
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -19,7 +24,8 @@ def balance():
     signal = np.sin(2 * np.pi * base_freq * t) + (harmonic_level / 100) * np.sin(2 * np.pi * 2 * base_freq * t)
     
     # Process the signal
-    balancer = EnhancedHarmonicBalancer(base_freq, num_harmonics=5, application='power')
+    # A fixed seed keeps the initial Psi identical between requests so the memo can hit
+    balancer = EnhancedHarmonicBalancer(base_freq, num_harmonics=5, application='power', seed=0, memo=memo)
     balanced_signal = balancer.balance_signal(signal, sample_rate=1000)
     
     # Calculate THD before and after
@@ -45,5 +51,9 @@ def balance():
         }
     })
 
+@app.route('/api/memo/stats')
+def memo_stats():
+    return jsonify(memo.stats())
+
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,38 @@
+"""
+Generate a synthetic capture and replay it against the library or the web app.
+
+    python examples/load_replay.py --channels 16 --duration 120 --rate 20
+    python examples/load_replay.py --url http://127.0.0.1:5000/api/balance --rate 50
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from src.workload import generate_workload, library_tasks, http_tasks, replay
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument('--kind', choices=['power', 'vibration'], default='power')
+parser.add_argument('--channels', type=int, default=8)
+parser.add_argument('--duration', type=float, default=60.0, help='seconds of capture per channel')
+parser.add_argument('--sample-rate', type=float, default=1000.0)
+parser.add_argument('--segment', type=int, default=1000, help='samples per request')
+parser.add_argument('--rate', type=float, default=None, help='requests per second (default: back to back)')
+parser.add_argument('--concurrency', type=int, default=4)
+parser.add_argument('--seed', type=int, default=0)
+parser.add_argument('--capture', default=None, help='write the capture to this .npy file via memmap')
+parser.add_argument('--url', default=None, help='replay against this /api/balance endpoint instead of the library')
+parser.add_argument('--trace-memory', action='store_true',
+                    help='also report the tracemalloc peak (slows the run; latency and throughput are not valid)')
+args = parser.parse_args()
+
+data = generate_workload(args.kind, num_channels=args.channels, duration=args.duration,
+                         sample_rate=args.sample_rate, seed=args.seed, path=args.capture)
+if args.url:
+    tasks = http_tasks(args.url, data, args.sample_rate, args.segment)
+else:
+    tasks = library_tasks(data, args.sample_rate, args.segment, application=args.kind, seed=args.seed)
+
+report = replay(tasks, rate=args.rate, concurrency=args.concurrency, trace_memory=args.trace_memory)
+print(json.dumps(report, indent=2))
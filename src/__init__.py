@@ -1 +1,3 @@
-from .harmonic_balancer import EnhancedHarmonicBalancer
\ No newline at end of file
+from .harmonic_balancer import EnhancedHarmonicBalancer
+from .calibration_cache import CalibrationCache
+from .memoization import BalanceMemo
\ No newline at end of file
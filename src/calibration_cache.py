@@ -0,0 +1,149 @@
+import hashlib
+import os
+import tempfile
+import numpy as np
+from scipy.fft import rfft
+
+CACHE_FORMAT_VERSION = 2
+
+
+def signal_fingerprint(signal_data: np.ndarray, sample_rate: float, base_frequency: float,
+                       num_harmonics: int, resolution: float = 0.05) -> tuple:
+    """
+    Summarize the harmonic content of a signal as a short, quantized tuple.
+
+    Each entry is the magnitude of harmonic k relative to the fundamental,
+    rounded to `resolution`, so recordings from the same feeder or machine
+    profile map to the same fingerprint despite noise and small level changes.
+    """
+    spectrum = np.abs(rfft(signal_data))
+    bin_width = sample_rate / len(signal_data)
+    bins = np.rint(base_frequency * np.arange(1, num_harmonics + 1) / bin_width).astype(int)
+    bins = bins[bins < len(spectrum)]
+    if len(bins) == 0 or spectrum[bins[0]] == 0:
+        return ()
+    ratios = spectrum[bins] / spectrum[bins[0]]
+    return tuple(int(x) for x in np.rint(ratios / resolution))
+
+
+class CalibrationCache:
+    """
+    Persistent on-disk store of converged Psi values and designed SOS filters.
+
+    Entries are keyed by (application, base frequency bucket, sample rate,
+    number of harmonics, signal fingerprint). Each entry is a small `.npz`
+    file stamped with CACHE_FORMAT_VERSION, written to a temporary file and
+    moved into place so concurrent workers never read a partial entry. When
+    more than `max_entries` files exist the least recently used are removed.
+    Warm hits only rewrite their entry when Psi moved by more than
+    `update_tolerance` radians.
+
+    Psi is shared across the whole frequency bucket, but filter designs are
+    tuned to one fundamental: each entry records the exact frequency its SOS
+    was designed for, and the SOS is only handed back for that frequency.
+    """
+
+    def __init__(self, directory: str, max_entries: int = 256, frequency_bucket: float = 0.5,
+                 update_tolerance: float = 1e-3):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.frequency_bucket = frequency_bucket
+        self.update_tolerance = update_tolerance
+        os.makedirs(directory, exist_ok=True)
+
+    def make_key(self, application: str, base_frequency: float, sample_rate: float,
+                 num_harmonics: int, fingerprint: tuple) -> str:
+        """Build the string key identifying a calibration."""
+        bucket = int(round(base_frequency / self.frequency_bucket))
+        fields = [application, bucket, float(sample_rate), int(num_harmonics)] + list(fingerprint)
+        return '|'.join(str(field) for field in fields)
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+        return os.path.join(self.directory, digest + '.npz')
+
+    def load(self, key: str, base_frequency: float = None):
+        """
+        Return (psi, sos) stored for `key`, or None on a miss.
+
+        `sos` is None when no filter design was stored, or when
+        `base_frequency` is given and differs from the frequency the stored
+        design was made for. Entries written by a different format version or
+        that cannot be read are discarded.
+        """
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as entry:
+                if int(entry['version']) != CACHE_FORMAT_VERSION or str(entry['key']) != key:
+                    raise ValueError("stale calibration entry")
+                psi = entry['psi'].copy()
+                sos = entry['sos'].copy() if entry['sos'].size else None
+                if base_frequency is not None and float(entry['design_frequency']) != float(base_frequency):
+                    sos = None
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError):
+            self._remove(path)
+            return None
+        # Touch the entry so eviction keeps recently used calibrations
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return psi, sos
+
+    def store(self, key: str, psi: np.ndarray, sos: np.ndarray = None, design_frequency: float = None):
+        """
+        Atomically write a calibration entry and evict old entries if needed.
+
+        `design_frequency` is the fundamental `sos` was designed for; without
+        it the design is not stored.
+        """
+        path = self._path(key)
+        if sos is None or design_frequency is None:
+            sos = np.empty((0, 6))
+            design_frequency = np.nan
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, version=np.array(CACHE_FORMAT_VERSION), key=np.array(key),
+                         psi=np.asarray(psi, dtype=np.float64), sos=np.asarray(sos, dtype=np.float64),
+                         design_frequency=np.array(float(design_frequency)))
+            os.replace(tmp_path, path)
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries beyond `max_entries`."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.npz'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                entries.append((os.path.getmtime(path), path))
+            except OSError:
+                continue
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort()
+        for _, path in entries[:len(entries) - self.max_entries]:
+            self._remove(path)
+
+    def clear(self):
+        """Remove every entry from the cache."""
+        for name in os.listdir(self.directory):
+            if name.endswith('.npz') or name.endswith('.tmp'):
+                self._remove(os.path.join(self.directory, name))
+
+    def __len__(self):
+        return sum(1 for name in os.listdir(self.directory) if name.endswith('.npz'))
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -4,16 +4,28 @@ from .circuit import QuantumResonanceCircuit
 from .utils.utils import generate_harmony_vector
 # from .utils.helpers import plot_convergence
 from .system import System
-from scipy.signal import find_peaks, butter, filtfilt, iirnotch
+from .calibration_cache import signal_fingerprint
+from scipy.signal import find_peaks, butter, filtfilt, iirnotch, sosfiltfilt, tf2sos, get_window
+from scipy.fft import rfft, rfftfreq
 from scipy.optimize import minimize
 
 class EnhancedHarmonicBalancer:
-    def __init__(self, base_frequency: float, num_harmonics: int = 5, application: str = 'power'):
+    def __init__(self, base_frequency: float, num_harmonics: int = 5, application: str = 'power',
+                 calibration_cache=None, dtype=np.float64, seed: int = None, memo=None):
         self.base_frequency = base_frequency
         self.num_harmonics = num_harmonics
         self.application = application
+        self.calibration_cache = calibration_cache
+        self.memo = memo
+        self.seed = seed
+        self.filter_designs = {}
+        self.dtype = np.dtype(dtype)
+        # Preallocated full-length buffers reused across calls, see get_workspace()
+        self.workspace = {}
         self.golden_ratio = (1 + np.sqrt(5)) / 2
-        self.psi = np.random.uniform(0, 2*np.pi, num_harmonics)
+        # A seed makes the initial Psi, and therefore the result, reproducible
+        rng = np.random if seed is None else np.random.RandomState(seed)
+        self.psi = rng.uniform(0, 2*np.pi, num_harmonics)
         self.frequencies = np.array([base_frequency * (i + 1) for i in range(num_harmonics)])
 
         # Setup logging
@@ -79,19 +91,36 @@ class EnhancedHarmonicBalancer:
         """Calculate amplitude at resonance condition."""
         return F0 / np.sqrt((k - m * omega**2)**2 + (b * omega)**2)
 
-    def wave_interference(self, y1: np.ndarray, y2: np.ndarray) -> np.ndarray:
+    def wave_interference(self, y1: np.ndarray, y2: np.ndarray, out: np.ndarray = None) -> np.ndarray:
         """Calculate wave interference between two signals."""
-        return y1 + y2
+        return np.add(y1, y2, out=out)
 
     def golden_harmony(self, R: float, F: float, E: float) -> float:
         """Calculate golden harmony metric."""
         return np.sqrt((R * F**2) + E**2)
 
+    def get_workspace(self, name: str, length: int, dtype=None) -> np.ndarray:
+        """Return a reusable buffer (of `self.dtype` by default), reallocating only when it no longer fits."""
+        dtype = self.dtype if dtype is None else np.dtype(dtype)
+        buffer = self.workspace.get(name)
+        if buffer is None or buffer.shape != (length,) or buffer.dtype != dtype:
+            buffer = np.empty(length, dtype=dtype)
+            self.workspace[name] = buffer
+        return buffer
+
+    def sample_index(self, length: int) -> np.ndarray:
+        """Return the cached sample numbers 0..length-1, independent of the sample rate."""
+        index = self.workspace.get('index')
+        if index is None or index.shape != (length,):
+            index = np.arange(length, dtype=np.int32 if length < 2**31 else np.int64)
+            self.workspace['index'] = index
+        return index
+
     def detect_base_frequency(self, signal_data: np.ndarray, sample_rate: float) -> float:
-        spectrum = np.abs(np.fft.fft(signal_data))
-        freqs = np.fft.fftfreq(len(signal_data), 1/sample_rate)
-        positive_spectrum = spectrum[:len(spectrum)//2]
-        positive_freqs = freqs[:len(freqs)//2]
+        # The real FFT holds exactly the positive half of the full spectrum
+        n = len(signal_data)
+        positive_spectrum = np.abs(rfft(signal_data)[:n//2])
+        positive_freqs = rfftfreq(n, 1/sample_rate)[:n//2]
 
         peaks, _ = find_peaks(positive_spectrum, height=max(positive_spectrum)/10)
 
@@ -108,31 +137,61 @@ class EnhancedHarmonicBalancer:
         return self.base_frequency
 
     def optimize_psi(self, signal_data: np.ndarray, sample_rate: float) -> float:
+        # The Psi correction is tiny next to the signal, so trial signals are
+        # always float64; in float32 its effect would be lost to rounding.
+        balanced = self.get_workspace('trial', len(signal_data), np.float64)
+        # apply_psi only uses 'phase' while building the trial signal, so it
+        # is free to hold |balanced| afterwards
+        magnitude = self.get_workspace('phase', len(signal_data), np.float64)
+
         def objective(psi):
-            balanced = self.apply_psi(signal_data, psi, sample_rate)
+            self.apply_psi(signal_data, psi, sample_rate, out=balanced)
             thd = self.calculate_thd(balanced, sample_rate)
-            harmony = self.golden_harmony(thd, self.base_frequency, np.mean(np.abs(balanced)))
+            harmony = self.golden_harmony(thd, self.base_frequency, np.mean(np.abs(balanced, out=magnitude)))
             return abs(harmony - self.golden_ratio)
 
         result = minimize(objective, self.psi, method='BFGS')
         self.psi = result.x
         return result.fun
 
-    def apply_psi(self, signal_data: np.ndarray, psi: np.ndarray, sample_rate: float) -> np.ndarray:
-        t = np.arange(len(signal_data)) / sample_rate
-        correction = np.zeros_like(signal_data)
+    def apply_psi(self, signal_data: np.ndarray, psi: np.ndarray, sample_rate: float,
+                  out: np.ndarray = None) -> np.ndarray:
+        n = len(signal_data)
+        index = self.sample_index(n)
+        phase = self.get_workspace('phase', n, np.float64)
+        if out is None:
+            out = np.empty(n, dtype=np.result_type(signal_data, self.dtype))
+        np.copyto(out, signal_data, casting='same_kind')
         for i, freq in enumerate(self.frequencies):
-            correction += self.resonance_condition(1, 1, 1, 2*np.pi*freq, 0.1) * np.sin(2 * np.pi * freq * t + psi[i])
-        return self.wave_interference(signal_data, -correction)
+            # Each term -amplitude * sin(2*pi*f*t + psi) is built in float64
+            # and interfered with `out` in place, without temporaries
+            np.multiply(index, 2 * np.pi * freq / sample_rate, out=phase)
+            phase += psi[i]
+            np.sin(phase, out=phase)
+            phase *= -self.resonance_condition(1, 1, 1, 2*np.pi*freq, 0.1)
+            self.wave_interference(out, phase, out=out)
+        return out
 
     def calculate_thd(self, signal_data: np.ndarray, sample_rate: float) -> float:
-        spectrum = np.abs(np.fft.fft(signal_data))
-        freqs = np.fft.fftfreq(len(signal_data), 1/sample_rate)
-        fundamental_idx = np.argmax(spectrum[:len(spectrum)//2])
-        harmonics = spectrum[fundamental_idx*2:fundamental_idx*(self.num_harmonics+1)]
+        # Use the real FFT; bins above Nyquist are mirrors of the positive half
+        n = len(signal_data)
+        spectrum = np.abs(rfft(signal_data))
+        fundamental_idx = np.argmax(spectrum[:n//2])
+        harmonic_bins = np.arange(fundamental_idx*2, min(fundamental_idx*(self.num_harmonics+1), n))
+        harmonics = spectrum[np.where(harmonic_bins <= n//2, harmonic_bins, n - harmonic_bins)]
         return np.sqrt(np.sum(harmonics**2)) / spectrum[fundamental_idx]
 
-    def balance_signal(self, signal_data: np.ndarray, sample_rate: float) -> np.ndarray:
+    def balance_signal(self, signal_data: np.ndarray, sample_rate: float, out: np.ndarray = None) -> np.ndarray:
+        """
+        Balance `signal_data` and return the result.
+
+        The signal is processed in `self.dtype`. When `out` is given the
+        result is written into it and `out` is returned; intermediate
+        buffers are reused across calls through the balancer's workspace.
+        With a memo attached, a request identical to an earlier one
+        (same samples, settings and starting Psi) returns the stored result.
+        """
+        signal_data = np.asarray(signal_data, dtype=self.dtype)
         detected_freq = self.detect_base_frequency(signal_data, sample_rate)
 
         # Update base_frequency if the detected frequency is significantly different
@@ -141,27 +200,310 @@ class EnhancedHarmonicBalancer:
             self.frequencies = np.array([self.base_frequency * (i + 1) for i in range(self.num_harmonics)])
             self.logger.info(f"Base frequency updated to {self.base_frequency} Hz")
 
+        # Warm-start from a stored calibration for this site/feeder profile
+        calibration_key = None
+        calibrated_psi = None
+        if self.calibration_cache is not None:
+            fingerprint = signal_fingerprint(signal_data, sample_rate, self.base_frequency, self.num_harmonics)
+            calibration_key = self.calibration_cache.make_key(
+                self.application, self.base_frequency, sample_rate, self.num_harmonics, fingerprint)
+            # The stored filter is only reused if it was designed for this exact fundamental
+            calibration = self.calibration_cache.load(calibration_key, base_frequency=self.base_frequency)
+            if calibration is not None:
+                self.psi, sos = calibration
+                calibrated_psi = self.psi.copy()
+                if sos is not None:
+                    self.filter_designs[(self.application, self.base_frequency, sample_rate)] = sos
+                self.logger.info("Warm-starting from stored calibration")
+
+        # The key covers everything the result depends on, including the starting Psi
+        memo_key = None
+        if self.memo is not None:
+            memo_key = self.memo.make_key(
+                signal_data, sample_rate=float(sample_rate), base_frequency=float(self.base_frequency),
+                num_harmonics=self.num_harmonics, application=self.application, psi=self.psi)
+            memoized = self.memo.get(memo_key)
+            if memoized is not None:
+                self.psi = memoized['psi'].copy()
+                if out is not None:
+                    np.copyto(out, memoized['balanced'], casting='same_kind')
+                    return out
+                return memoized['balanced'].copy()
+
         self.optimize_psi(signal_data, sample_rate)
-        balanced = self.apply_psi(signal_data, self.psi, sample_rate)
 
         # Apply application-specific processing
-        if self.application == 'power':
-            balanced = self.power_specific_processing(balanced, sample_rate)
-        elif self.application == 'vibration':
-            balanced = self.vibration_specific_processing(balanced, sample_rate)
+        if self.application in ('power', 'vibration'):
+            balanced = self.apply_psi(signal_data, self.psi, sample_rate,
+                                      out=self.get_workspace('balanced', len(signal_data)))
+            if self.application == 'power':
+                balanced = self.power_specific_processing(balanced, sample_rate)
+            else:
+                balanced = self.vibration_specific_processing(balanced, sample_rate)
+            if out is not None:
+                np.copyto(out, balanced, casting='same_kind')
+                balanced = out
+            elif balanced is self.workspace['balanced']:
+                balanced = balanced.copy()
+        else:
+            balanced = self.apply_psi(signal_data, self.psi, sample_rate, out=out)
+
+        # Only write on a miss or when Psi moved away from the stored calibration
+        if calibration_key is not None and (
+                calibrated_psi is None
+                or np.max(np.abs(self.psi - calibrated_psi)) > self.calibration_cache.update_tolerance):
+            self.calibration_cache.store(calibration_key, self.psi, self.design_filter(sample_rate),
+                                         design_frequency=self.base_frequency)
+        if memo_key is not None:
+            self.memo.put(memo_key, {'balanced': balanced, 'psi': self.psi})
 
         return balanced
 
+    def balance_signal_windowed(self, signal_data: np.ndarray, sample_rate: float, frame_length: int = None,
+                                hop_length: int = None, iterations: int = 30, block_size: int = None,
+                                filter_resolution: float = 0.1, memory_budget: int = 64 * 2**20) -> np.ndarray:
+        """
+        Balance a long recording whose fundamental drifts over time.
+
+        The signal is cut into overlapping Hann-weighted frames (one second
+        rounded down to an even length, with 50% overlap by default). The
+        fundamental and harmonic content of every frame come from a single
+        STFT, Psi is optimized for all frames at once, and the balanced
+        frames are recombined with overlap-add.
+        Frames are filtered in groups sharing a fundamental rounded to
+        `filter_resolution` Hz. Per-frame results are stored in
+        `self.frame_analysis`.
+
+        Psi is optimized `block_size` frames at a time. By default the block
+        size is chosen so the float64 harmonic bases and their spectra of one
+        block fit in `memory_budget` bytes.
+        """
+        signal_data = np.asarray(signal_data, dtype=self.dtype)
+        n = len(signal_data)
+        # Default to about one second, rounded down to even so the default hop divides it
+        frame_length = 2 * (int(sample_rate) // 2) if frame_length is None else int(frame_length)
+        hop_length = frame_length // 2 if hop_length is None else int(hop_length)
+        if hop_length <= 0 or hop_length > frame_length // 2 or frame_length % hop_length != 0:
+            raise ValueError("hop_length must divide frame_length and be at most half of it")
+        if n <= frame_length:
+            return self.balance_signal(signal_data, sample_rate)
+
+        # Centre the frames on the signal edges and pad the tail to a whole number of hops
+        pad = frame_length // 2
+        num_frames = 1 + -(-(n + 2 * pad - frame_length) // hop_length)
+        tail = (num_frames - 1) * hop_length + frame_length - n - pad
+        padded = np.pad(signal_data, (pad, tail), mode='reflect')
+        frames = np.lib.stride_tricks.sliding_window_view(padded, frame_length)[::hop_length]
+        starts = np.arange(num_frames) * hop_length - pad
+        window = get_window('hann', frame_length).astype(self.dtype)
+
+        if block_size is None:
+            # Sine and cosine bases plus their spectra take about 32 bytes per
+            # frame sample and harmonic; leave headroom for FFT workspace
+            block_size = max(1, int(memory_budget) // (self.num_harmonics * frame_length * 48))
+
+        balanced = np.empty_like(frames)
+        frequencies = np.empty(num_frames)
+        harmonics = np.empty((num_frames, self.num_harmonics))
+        psi = np.tile(self.psi, (num_frames, 1))
+        thd = np.empty(num_frames)
+        for lo in range(0, num_frames, block_size):
+            block = slice(lo, lo + block_size)
+            frequencies[block], harmonics[block] = self.analyze_frames(frames[block], window, sample_rate)
+            balanced[block], psi[block], thd[block] = self.optimize_frame_psi(
+                frames[block], starts[block], frequencies[block], psi[block], sample_rate, iterations)
+
+        # Apply application-specific processing, batching frames with a shared filter design
+        if self.application in ('power', 'vibration'):
+            filter_frequencies = np.round(frequencies / filter_resolution) * filter_resolution
+            for base_frequency in np.unique(filter_frequencies):
+                members = np.nonzero(filter_frequencies == base_frequency)[0]
+                sos = self.design_filter(sample_rate, base_frequency=float(base_frequency))
+                if sos is None:
+                    continue
+                sos = sos.astype(self.dtype, copy=False)
+                for lo in range(0, len(members), block_size):
+                    chunk = members[lo:lo + block_size]
+                    balanced[chunk] = sosfiltfilt(sos, balanced[chunk], axis=-1)
+            if self.application == 'power':
+                balanced *= (1 + 0.1 * self.apply_quantum_resonance())
+
+        # Overlap-add: every (frame_length // hop_length)-th frame tiles the signal without overlap
+        balanced *= window
+        output = np.zeros(len(padded), dtype=self.dtype)
+        weight = np.zeros(len(padded), dtype=self.dtype)
+        frames_per_hop = frame_length // hop_length
+        for offset in range(frames_per_hop):
+            group = balanced[offset::frames_per_hop]
+            start = offset * hop_length
+            stop = start + group.size
+            output[start:stop].reshape(-1, frame_length)[...] += group
+            weight[start:stop].reshape(-1, frame_length)[...] += window
+
+        self.frame_analysis = {
+            'times': (starts + frame_length / 2) / sample_rate,
+            'frequencies': frequencies,
+            'harmonics': harmonics,
+            'psi': psi,
+            'thd': thd,
+        }
+        self.psi = psi[-1].copy()
+        self.base_frequency = float(frequencies[-1])
+        self.frequencies = np.array([self.base_frequency * (i + 1) for i in range(self.num_harmonics)])
+
+        return output[pad:pad + n] / weight[pad:pad + n]
+
+    def analyze_frames(self, frames: np.ndarray, window: np.ndarray, sample_rate: float):
+        """
+        Detect the fundamental and harmonic amplitudes of every frame.
+
+        Returns (frequencies, harmonics) with shapes (frames,) and
+        (frames, num_harmonics). The fundamental is the strongest bin within
+        20% of the nominal base frequency, refined by parabolic
+        interpolation; frames without a clear peak keep the nominal value.
+        """
+        num_frames, frame_length = frames.shape
+        spectrum = np.abs(rfft(frames * window, axis=-1))
+        bin_width = sample_rate / frame_length
+        rows = np.arange(num_frames)
+
+        lo = max(int(np.ceil(0.8 * self.base_frequency / bin_width)), 1)
+        hi = min(int(np.floor(1.2 * self.base_frequency / bin_width)), spectrum.shape[1] - 2)
+        frequencies = np.full(num_frames, float(self.base_frequency))
+        if lo <= hi:
+            peak = lo + np.argmax(spectrum[:, lo:hi + 1], axis=1)
+            tiny = np.finfo(spectrum.dtype).tiny
+            left, centre, right = (np.log(spectrum[rows, peak + d] + tiny) for d in (-1, 0, 1))
+            curvature = left - 2 * centre + right
+            offset = np.where(curvature < 0, 0.5 * (left - right) / np.where(curvature < 0, curvature, -1), 0)
+            strong = spectrum[rows, peak] >= spectrum[:, 1:].max(axis=1) / 10
+            frequencies[strong] = ((peak + offset) * bin_width)[strong]
+
+        harmonic_bins = np.rint(frequencies[:, None] * np.arange(1, self.num_harmonics + 1) / bin_width).astype(int)
+        harmonic_bins = np.minimum(harmonic_bins, spectrum.shape[1] - 1)
+        harmonics = spectrum[rows[:, None], harmonic_bins] * (2 / window.sum())
+        return frequencies, harmonics
+
+    def optimize_frame_psi(self, frames: np.ndarray, starts: np.ndarray, frequencies: np.ndarray,
+                           psi: np.ndarray, sample_rate: float, iterations: int = 30):
+        """
+        Optimize Psi for a block of frames simultaneously.
+
+        Uses sin(x + psi) = cos(psi) sin(x) + sin(psi) cos(x): the sine and
+        cosine bases and their spectra are computed once, so each objective
+        evaluation for all frames is a small batched matrix product instead
+        of a new FFT. Psi descends along the normalized finite-difference
+        gradient with a per-frame step size that grows on improvement and
+        halves otherwise. Returns (balanced frames, psi, thd).
+        """
+        num_frames, frame_length = frames.shape
+        t = (starts[:, None] + np.arange(frame_length)) / sample_rate
+        omega = 2 * np.pi * frequencies[:, None] * np.arange(1, self.num_harmonics + 1)
+        amplitude = self.resonance_condition(1, 1, 1, omega, 0.1)[:, :, None]
+        # Bases stay float64, as in optimize_psi, so the tiny correction survives rounding.
+        # The phase buffer becomes the sine basis, so only two (frames, harmonics, length)
+        # arrays exist before the spectra are taken.
+        theta = omega[:, :, None] * t[:, None, :]
+        del t
+        cos_basis = np.cos(theta)
+        cos_basis *= amplitude
+        sin_basis = np.sin(theta, out=theta)
+        sin_basis *= amplitude
+        del theta
+        frames_fft = rfft(frames, axis=-1)
+        sin_fft = rfft(sin_basis, axis=-1)
+        cos_fft = rfft(cos_basis, axis=-1)
+
+        def evaluate(psi):
+            c = np.cos(psi)[:, None, :]
+            s = np.sin(psi)[:, None, :]
+            balanced = frames - (c @ sin_basis)[:, 0] - (s @ cos_basis)[:, 0]
+            spectrum = np.abs(frames_fft - (c @ sin_fft)[:, 0] - (s @ cos_fft)[:, 0])
+            thd = self.batched_thd(spectrum, frame_length)
+            harmony = self.golden_harmony(thd, frequencies, np.mean(np.abs(balanced), axis=1))
+            return np.abs(harmony - self.golden_ratio), balanced, thd
+
+        psi = np.array(psi, dtype=float)
+        objective = evaluate(psi)[0]
+        step = np.full(num_frames, 0.5)
+        delta = np.sqrt(np.finfo(np.float64).eps)
+        for _ in range(iterations):
+            gradient = np.empty_like(psi)
+            for k in range(self.num_harmonics):
+                trial = psi.copy()
+                trial[:, k] += delta
+                gradient[:, k] = (evaluate(trial)[0] - objective) / delta
+            norm = np.linalg.norm(gradient, axis=1)
+            candidate = psi - (step / np.where(norm > 0, norm, 1))[:, None] * gradient
+            candidate_objective = evaluate(candidate)[0]
+            improved = candidate_objective < objective
+            psi[improved] = candidate[improved]
+            objective[improved] = candidate_objective[improved]
+            step = np.where(improved, step * 1.2, step * 0.5)
+            if np.all(step < self.convergence_threshold):
+                break
+
+        _, balanced, thd = evaluate(psi)
+        return balanced.astype(self.dtype, copy=False), psi, thd
+
+    def batched_thd(self, spectrum: np.ndarray, n: int) -> np.ndarray:
+        """
+        Vectorized calculate_thd for rows of real-FFT magnitudes of length-n frames.
+        """
+        rows = np.arange(spectrum.shape[0])
+        fundamental_idx = np.argmax(spectrum[:, :n//2], axis=1)
+        # Energy of full-spectrum bins [0, j) for every j, mirroring bins above Nyquist
+        bins = np.arange(n)
+        full_power = spectrum[:, np.where(bins <= n//2, bins, n - bins)] ** 2
+        cumulative = np.concatenate([np.zeros((len(rows), 1)), np.cumsum(full_power, axis=1)], axis=1)
+        lo = np.minimum(fundamental_idx * 2, n)
+        hi = np.maximum(np.minimum(fundamental_idx * (self.num_harmonics + 1), n), lo)
+        energy = np.maximum(cumulative[rows, hi] - cumulative[rows, lo], 0)
+        return np.sqrt(energy) / spectrum[rows, fundamental_idx]
+
+    def design_filter(self, sample_rate: float, application: str = None, base_frequency: float = None):
+        """
+        Design the application-specific filter as second-order sections.
+
+        Designs are memoized per (application, base_frequency, sample_rate)
+        and can be seeded from a calibration cache. `base_frequency`
+        defaults to the balancer's current fundamental. Returns None for
+        applications without a filter stage.
+        """
+        application = application or self.application
+        base_frequency = self.base_frequency if base_frequency is None else base_frequency
+        key = (application, base_frequency, sample_rate)
+        if key in self.filter_designs:
+            return self.filter_designs[key]
+
+        if application == 'power':
+            # Cascade of notch filters at each harmonic above the fundamental
+            sections = []
+            for harmonic in range(2, self.num_harmonics + 1):
+                notch_freq = harmonic * base_frequency
+                q = 30.0  # Quality factor
+                w0 = notch_freq / (sample_rate / 2)
+                b, a = iirnotch(w0, q)
+                sections.append(tf2sos(b, a))
+            sos = np.vstack(sections) if sections else None
+        elif application == 'vibration':
+            cutoff_freq = 2 * base_frequency  # Adjust as needed
+            nyquist = 0.5 * sample_rate
+            normal_cutoff = cutoff_freq / nyquist
+            sos = butter(4, normal_cutoff, btype='low', analog=False, output='sos')
+        else:
+            sos = None
+
+        self.filter_designs[key] = sos
+        return sos
+
     def power_specific_processing(self, signal_data: np.ndarray, sample_rate: float) -> np.ndarray:
         # Apply quantum entanglement simulation
         entanglement_effect = self.quantum_entanglement_simulation(self.num_harmonics)
         # Apply a series of notch filters to remove specific harmonics
-        for harmonic in range(2, self.num_harmonics + 1):
-            notch_freq = harmonic * self.base_frequency
-            q = 30.0  # Quality factor
-            w0 = notch_freq / (sample_rate / 2)
-            b, a = iirnotch(w0, q)
-            signal_data = filtfilt(b, a, signal_data)
+        sos = self.design_filter(sample_rate, 'power')
+        if sos is not None:
+            signal_data = sosfiltfilt(sos.astype(self.dtype, copy=False), signal_data)
 
         # Apply quantum influence
         quantum_influence = self.apply_quantum_resonance()
@@ -172,11 +514,7 @@ class EnhancedHarmonicBalancer:
 
     def vibration_specific_processing(self, signal_data: np.ndarray, sample_rate: float) -> np.ndarray:
         # Implement a simple low-pass filter to reduce high-frequency components
-        cutoff_freq = 2 * self.base_frequency  # Adjust as needed
-        nyquist = 0.5 * sample_rate
-        normal_cutoff = cutoff_freq / nyquist
-        b, a = butter(4, normal_cutoff, btype='low', analog=False)
-        return filtfilt(b, a, signal_data)
+        return sosfiltfilt(self.design_filter(sample_rate, 'vibration').astype(self.dtype, copy=False), signal_data)
 
     def quantum_entanglement_simulation(self, num_harmonics):
         # Implement a simple quantum entanglement simulation
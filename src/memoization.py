@@ -0,0 +1,158 @@
+import hashlib
+import io
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+
+
+class BalanceMemo:
+    """
+    Content-addressed memo of balancing results.
+
+    Keys are BLAKE2 digests of the raw input buffer plus every parameter that
+    influences the result, so identical requests map to the same entry. Values
+    are dicts of numpy arrays held in an in-process LRU bounded by
+    `max_entries` and `max_bytes`; entries older than `ttl` seconds are
+    treated as misses. When `path` is given, entries are also written to a
+    SQLite database so separate worker processes share results; the database
+    is held to the same `max_entries` and `max_bytes` by the size of the
+    stored `.npz` blobs.
+    """
+
+    def __init__(self, max_entries: int = 128, max_bytes: int = 64 * 2**20, ttl: float = None, path: str = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.path = path
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.connection = None
+        if path is not None:
+            self.connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            with self.connection:
+                self.connection.execute(
+                    "CREATE TABLE IF NOT EXISTS memo "
+                    "(key TEXT PRIMARY KEY, created REAL, accessed REAL, value BLOB, size INTEGER)")
+                # Databases created before sizes were tracked get the column backfilled
+                columns = [row[1] for row in self.connection.execute("PRAGMA table_info(memo)")]
+                if 'size' not in columns:
+                    self.connection.execute("ALTER TABLE memo ADD COLUMN size INTEGER")
+                    self.connection.execute("UPDATE memo SET size = length(value)")
+
+    @staticmethod
+    def make_key(signal_data: np.ndarray, **params) -> str:
+        """Hash the raw bytes, dtype and shape of `signal_data` together with `params`."""
+        digest = hashlib.blake2b(digest_size=16)
+        signal_data = np.ascontiguousarray(signal_data)
+        digest.update(str((signal_data.dtype.str, signal_data.shape)).encode('utf-8'))
+        digest.update(memoryview(signal_data).cast('B'))
+        for name in sorted(params):
+            value = params[name]
+            digest.update(name.encode('utf-8'))
+            if isinstance(value, np.ndarray):
+                value = np.ascontiguousarray(value)
+                digest.update(str((value.dtype.str, value.shape)).encode('utf-8'))
+                digest.update(memoryview(value).cast('B'))
+            else:
+                digest.update(repr(value).encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key: str):
+        """Return the stored dict of arrays for `key`, or None on a miss."""
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                created, value, _ = entry
+                if self.ttl is None or now - created <= self.ttl:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._discard(key)
+
+            if self.connection is not None:
+                row = self.connection.execute("SELECT created, value FROM memo WHERE key = ?", (key,)).fetchone()
+                if row is not None and (self.ttl is None or now - row[0] <= self.ttl):
+                    with self.connection:
+                        self.connection.execute("UPDATE memo SET accessed = ? WHERE key = ?", (now, key))
+                    with np.load(io.BytesIO(row[1]), allow_pickle=False) as stored:
+                        value = {name: stored[name] for name in stored.files}
+                    self._insert(key, row[0], value)
+                    self.hits += 1
+                    return value
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: dict):
+        """Store a dict of arrays under `key`, evicting old entries as needed."""
+        value = {name: np.array(array) for name, array in value.items()}
+        now = time.time()
+        with self.lock:
+            self._insert(key, now, value)
+            if self.connection is not None:
+                buffer = io.BytesIO()
+                np.savez(buffer, **value)
+                data = buffer.getvalue()
+                with self.connection:
+                    if len(data) > self.max_bytes:
+                        # Too large to share; drop any older result stored under the key
+                        self.connection.execute("DELETE FROM memo WHERE key = ?", (key,))
+                        return
+                    self.connection.execute(
+                        "INSERT OR REPLACE INTO memo (key, created, accessed, value, size) VALUES (?, ?, ?, ?, ?)",
+                        (key, now, now, data, len(data)))
+                    if self.ttl is not None:
+                        self.connection.execute("DELETE FROM memo WHERE created < ?", (now - self.ttl,))
+                    # Keep the shared store within the same entry and byte budgets, oldest access first
+                    stale = []
+                    count = total = 0
+                    for row_key, size in self.connection.execute("SELECT key, size FROM memo ORDER BY accessed DESC"):
+                        count += 1
+                        total += size
+                        if count > self.max_entries or total > self.max_bytes:
+                            stale.append((row_key,))
+                    self.connection.executemany("DELETE FROM memo WHERE key = ?", stale)
+
+    def stats(self) -> dict:
+        """Return hit/miss counts, hit rate and current in-process size."""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self.entries),
+                'bytes': self.total_bytes,
+            }
+
+    def clear(self):
+        """Drop every entry and reset the statistics."""
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            if self.connection is not None:
+                with self.connection:
+                    self.connection.execute("DELETE FROM memo")
+
+    def _insert(self, key: str, created: float, value: dict):
+        size = sum(array.nbytes for array in value.values())
+        self._discard(key)
+        if size > self.max_bytes:
+            return
+        self.entries[key] = (created, value, size)
+        self.total_bytes += size
+        while len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes:
+            self._discard(next(iter(self.entries)))
+
+    def _discard(self, key: str):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry[2]
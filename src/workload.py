@@ -0,0 +1,243 @@
+import json
+import sys
+import threading
+import time
+import tracemalloc
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from .harmonic_balancer import EnhancedHarmonicBalancer
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Relative harmonic amplitudes (fundamental first) for each workload kind
+WORKLOAD_PROFILES = {
+    # Odd harmonics typical of rectifier loads
+    'power': {'base_frequency': 60.0, 'harmonics': (1.0, 0.0, 0.15, 0.0, 0.1, 0.0, 0.05)},
+    # Progressively decaying harmonics of a rotating machine
+    'vibration': {'base_frequency': 30.0, 'harmonics': (1.0, 0.5, 0.33, 0.25, 0.2)},
+}
+
+# Noise is drawn in fixed blocks with their own random streams; chunks are whole blocks
+NOISE_BLOCK = 2**14
+
+
+def generate_workload(kind: str = 'power', num_channels: int = 8, duration: float = 60.0,
+                      sample_rate: float = 1000.0, drift: float = 0.5, drift_period: float = 30.0,
+                      noise: float = 0.02, seed: int = 0, path: str = None, chunk_size: int = 2**18,
+                      dtype=np.float64) -> np.ndarray:
+    """
+    Generate a reproducible multi-channel power or vibration dataset.
+
+    Returns an array of shape (num_channels, samples). Each channel has its
+    own harmonic levels and a fundamental that drifts sinusoidally by up to
+    `drift` Hz with period `drift_period` seconds, plus white noise. Samples
+    are generated in chunks of `chunk_size` with a closed-form phase and a
+    random stream per NOISE_BLOCK samples, so the output does not depend on
+    `chunk_size` (which is rounded up to a multiple of NOISE_BLOCK).
+    When `path` is given, chunks are written to a `.npy` file through a
+    memmap and the memmap is returned, keeping memory flat for long captures.
+    """
+    if kind not in WORKLOAD_PROFILES:
+        raise ValueError(f"Unknown workload kind: {kind}")
+    profile = WORKLOAD_PROFILES[kind]
+    base_frequency = profile['base_frequency']
+    num_samples = int(round(duration * sample_rate))
+
+    # Per-channel variation: harmonic levels, drift phase and starting phase
+    rng = np.random.default_rng(seed)
+    levels = np.array(profile['harmonics']) * rng.uniform(0.5, 1.5, (num_channels, len(profile['harmonics'])))
+    levels[:, 0] = 1.0
+    drift_phase = rng.uniform(0, 2*np.pi, num_channels)[:, None]
+    start_phase = rng.uniform(0, 2*np.pi, num_channels)[:, None]
+    orders = np.arange(1, len(profile['harmonics']) + 1)
+    chunk_size = -(-chunk_size // NOISE_BLOCK) * NOISE_BLOCK
+
+    if path is not None:
+        data = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=(num_channels, num_samples))
+    else:
+        data = np.empty((num_channels, num_samples), dtype=dtype)
+
+    for start in range(0, num_samples, chunk_size):
+        stop = min(start + chunk_size, num_samples)
+        t = np.arange(start, stop) / sample_rate
+        # Integral of base_frequency + drift * sin(2*pi*t/drift_period + drift_phase)
+        cycles = (base_frequency * t
+                  - drift * drift_period / (2*np.pi) * (np.cos(2*np.pi*t/drift_period + drift_phase) - np.cos(drift_phase)))
+        phase = 2*np.pi*cycles + start_phase
+        chunk = np.zeros((num_channels, stop - start))
+        for k, order in enumerate(orders):
+            if np.any(levels[:, k]):
+                chunk += levels[:, k, None] * np.sin(order * phase)
+        for block_start in range(start, stop, NOISE_BLOCK):
+            block_rng = np.random.default_rng([seed, block_start // NOISE_BLOCK])
+            block = block_rng.standard_normal((num_channels, NOISE_BLOCK))[:, :stop - block_start]
+            chunk[:, block_start - start:block_start - start + block.shape[1]] += noise * block
+        data[:, start:stop] = chunk
+
+    if path is not None:
+        data.flush()
+    return data
+
+
+def library_tasks(signals: np.ndarray, sample_rate: float, segment_length: int, base_frequency: float = None,
+                  application: str = 'power', num_harmonics: int = 5, seed: int = None, memo=None):
+    """
+    Yield tasks that balance consecutive segments of every channel through the library API.
+
+    Each task builds its own balancer, as the web app does per request, and
+    returns the relative THD improvement of its segment.
+    """
+    if base_frequency is None:
+        base_frequency = WORKLOAD_PROFILES.get(application, WORKLOAD_PROFILES['power'])['base_frequency']
+    for start in range(0, signals.shape[1] - segment_length + 1, segment_length):
+        for channel in range(signals.shape[0]):
+            segment = np.array(signals[channel, start:start + segment_length])
+
+            def task(segment=segment):
+                balancer = EnhancedHarmonicBalancer(base_frequency, num_harmonics=num_harmonics,
+                                                    application=application, seed=seed, memo=memo)
+                balanced = balancer.balance_signal(segment, sample_rate)
+                thd_before = balancer.calculate_thd(segment, sample_rate)
+                return (thd_before - balancer.calculate_thd(balanced, sample_rate)) / thd_before
+
+            yield task
+
+
+def http_tasks(url: str, signals: np.ndarray, sample_rate: float, segment_length: int,
+               base_frequency: float = 60.0, num_harmonics: int = 7, timeout: float = 30.0):
+    """
+    Yield tasks that POST the parameters of each segment to the `/api/balance` endpoint.
+
+    The endpoint synthesizes its own signal from `baseFreq` and
+    `harmonicLevel`, so each segment is summarized by its detected
+    fundamental (0.1 Hz resolution) and its THD over the first
+    `num_harmonics` harmonics in percent. The endpoint places that level on
+    the second harmonic, so the total distortion matches the segment even
+    when it comes from odd harmonics. Tasks return the improvement reported
+    by the endpoint.
+    """
+    probe = EnhancedHarmonicBalancer(base_frequency, num_harmonics=num_harmonics)
+    for start in range(0, signals.shape[1] - segment_length + 1, segment_length):
+        for channel in range(signals.shape[0]):
+            segment = np.asarray(signals[channel, start:start + segment_length])
+            fundamental = probe.detect_base_frequency(segment, sample_rate)
+            level = 100 * probe.calculate_thd(segment, sample_rate)
+            payload = json.dumps({'baseFreq': round(float(fundamental), 1),
+                                  'harmonicLevel': int(round(level))}).encode('utf-8')
+
+            def task(payload=payload):
+                request = urllib.request.Request(url, data=payload, headers={'Content-Type': 'application/json'})
+                with urllib.request.urlopen(request, timeout=timeout) as response:
+                    metrics = json.loads(response.read().decode('utf-8'))['metrics']
+                return float(metrics['improvement'].rstrip('%')) / 100
+
+            yield task
+
+
+def replay(tasks, rate: float = None, concurrency: int = 1, trace_memory: bool = False) -> dict:
+    """
+    Run `tasks` and report throughput, latency, memory and THD improvement.
+
+    With `rate` (requests per second) tasks are started on a fixed
+    open-loop schedule, and latency is measured from each task's scheduled
+    start so queueing behind slow requests is included. Without it the
+    replay is closed-loop: each of the `concurrency` workers starts its next
+    task as soon as the previous one finishes, and latency is service time.
+
+    `process_max_rss_bytes` is the high-water mark of the whole process,
+    including everything allocated before the replay; `max_rss_growth_bytes`
+    is how far the replay raised it. `trace_memory` additionally reports the
+    tracemalloc peak of the run, but tracing slows every allocation:
+    throughput and latency from a traced run are not representative, so
+    measure them in a separate untraced run.
+
+    Failed tasks are counted in `errors`, with a count per exception type
+    and the first exception (in task order) kept in the report.
+    """
+    latencies = []
+    improvements = []
+    error_types = {}
+    first_error = None
+    slots = threading.BoundedSemaphore(concurrency)
+
+    def run(task, scheduled):
+        if scheduled is None:
+            scheduled = time.perf_counter()
+        error = None
+        try:
+            improvement = task()
+        except Exception as exc:
+            improvement, error = None, exc
+        finally:
+            if rate is None:
+                slots.release()
+        return time.perf_counter() - scheduled, improvement, error
+
+    rss_before = _max_rss_bytes()
+    if trace_memory:
+        tracemalloc.start()
+    start_time = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = []
+            for i, task in enumerate(tasks):
+                if rate is None:
+                    slots.acquire()
+                    scheduled = None
+                else:
+                    scheduled = start_time + i / rate
+                    delay = scheduled - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                futures.append(executor.submit(run, task, scheduled))
+            for future in futures:
+                latency, improvement, error = future.result()
+                latencies.append(latency)
+                if error is None:
+                    improvements.append(improvement)
+                    continue
+                name = type(error).__name__
+                error_types[name] = error_types.get(name, 0) + 1
+                if first_error is None:
+                    first_error = repr(error)
+        elapsed = time.perf_counter() - start_time
+        peak_memory = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+
+    rss_after = _max_rss_bytes()
+    latencies = np.array(latencies)
+    improvements = np.array(improvements)
+    return {
+        'requests': len(latencies),
+        'errors': sum(error_types.values()),
+        'error_types': error_types,
+        'first_error': first_error,
+        'duration': elapsed,
+        'throughput': len(latencies) / elapsed if elapsed > 0 else 0.0,
+        'latency': _percentiles(latencies),
+        'peak_traced_memory': peak_memory,
+        'process_max_rss_bytes': rss_after,
+        'max_rss_growth_bytes': rss_after - rss_before if rss_after is not None else None,
+        'thd_improvement': dict(_percentiles(improvements), mean=float(improvements.mean()) if len(improvements) else None),
+    }
+
+
+def _max_rss_bytes():
+    if resource is None:
+        return None
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux and the BSDs
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+def _percentiles(values: np.ndarray) -> dict:
+    if len(values) == 0:
+        return {'p50': None, 'p90': None, 'p99': None, 'max': None}
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return {'p50': float(p50), 'p90': float(p90), 'p99': float(p99), 'max': float(values.max())}
@@ -0,0 +1,114 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from src.calibration_cache import CalibrationCache, CACHE_FORMAT_VERSION, signal_fingerprint
+from src.harmonic_balancer import EnhancedHarmonicBalancer
+
+class TestCalibrationCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = CalibrationCache(self.tmpdir.name, max_entries=3)
+        t = np.arange(1000) / 1000
+        self.signal = np.sin(2 * np.pi * 60 * t) + 0.5 * np.sin(2 * np.pi * 120 * t)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_store_and_load_roundtrip(self):
+        key = self.cache.make_key('power', 60, 1000, 5, (20, 10))
+        psi = np.arange(5, dtype=float)
+        sos = np.ones((2, 6))
+        self.cache.store(key, psi, sos, design_frequency=60.0)
+        loaded_psi, loaded_sos = self.cache.load(key)
+        np.testing.assert_array_equal(loaded_psi, psi)
+        np.testing.assert_array_equal(loaded_sos, sos)
+        np.testing.assert_array_equal(self.cache.load(key, base_frequency=60.0)[1], sos)
+        # Psi is shared within the bucket, a filter for another fundamental is not
+        loaded_psi, loaded_sos = self.cache.load(key, base_frequency=60.2)
+        np.testing.assert_array_equal(loaded_psi, psi)
+        self.assertIsNone(loaded_sos)
+        self.assertIsNone(self.cache.load(self.cache.make_key('vibration', 60, 1000, 5, (20, 10))))
+
+    def test_frequency_bucket(self):
+        key_a = self.cache.make_key('power', 60.1, 1000, 5, ())
+        key_b = self.cache.make_key('power', 59.9, 1000, 5, ())
+        key_c = self.cache.make_key('power', 61.0, 1000, 5, ())
+        self.assertEqual(key_a, key_b)
+        self.assertNotEqual(key_a, key_c)
+
+    def test_fingerprint_tolerates_noise(self):
+        fingerprint = signal_fingerprint(self.signal, 1000, 60, 5)
+        noisy = self.signal + np.random.normal(0, 0.001, self.signal.shape)
+        self.assertEqual(signal_fingerprint(noisy, 1000, 60, 5), fingerprint)
+        self.assertEqual(signal_fingerprint(2 * self.signal, 1000, 60, 5), fingerprint)
+
+    def test_eviction_bounds_size(self):
+        for i in range(5):
+            path_time = 1000000 + i
+            key = self.cache.make_key('power', 60, 1000, 5, (i,))
+            self.cache.store(key, np.zeros(5))
+            os.utime(self.cache._path(key), (path_time, path_time))
+        self.cache.store(self.cache.make_key('power', 60, 1000, 5, (5,)), np.zeros(5))
+        self.assertEqual(len(self.cache), 3)
+        # The oldest entries are the ones evicted
+        self.assertIsNone(self.cache.load(self.cache.make_key('power', 60, 1000, 5, (0,))))
+        self.assertIsNotNone(self.cache.load(self.cache.make_key('power', 60, 1000, 5, (5,))))
+
+    def test_stale_version_is_a_miss(self):
+        key = self.cache.make_key('power', 60, 1000, 5, ())
+        with open(self.cache._path(key), 'wb') as f:
+            np.savez(f, version=np.array(CACHE_FORMAT_VERSION + 1), key=np.array(key),
+                     psi=np.zeros(5), sos=np.empty((0, 6)))
+        self.assertIsNone(self.cache.load(key))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_balancer_warm_start(self):
+        balancer = EnhancedHarmonicBalancer(60, num_harmonics=5, application='power', calibration_cache=self.cache)
+        balancer.balance_signal(self.signal, sample_rate=1000)
+        self.assertEqual(len(self.cache), 1)
+
+        # A new worker picks up the converged Psi and filter design
+        worker = EnhancedHarmonicBalancer(60, num_harmonics=5, application='power', calibration_cache=self.cache)
+        worker.psi = np.full(5, np.nan)
+        balanced = worker.balance_signal(self.signal, sample_rate=1000)
+        self.assertFalse(np.any(np.isnan(balanced)))
+        np.testing.assert_allclose(worker.psi, balancer.psi, atol=1e-6)
+        np.testing.assert_array_equal(worker.design_filter(1000), balancer.design_filter(1000))
+
+    def test_neighbouring_frequency_redesigns_filter(self):
+        t = np.arange(10000) / 1000
+
+        def capture(frequency):
+            return sum(amplitude * np.sin(2 * np.pi * frequency * (i + 1) * t)
+                       for i, amplitude in enumerate([1, 0.5, 0.3, 0.2, 0.1]))
+
+        first = EnhancedHarmonicBalancer(60.2, num_harmonics=5, application='power', calibration_cache=self.cache)
+        first.balance_signal(capture(60.2), sample_rate=1000)
+
+        worker = EnhancedHarmonicBalancer(59.8, num_harmonics=5, application='power', calibration_cache=self.cache)
+        self.assertEqual(self.cache.make_key('power', first.base_frequency, 1000, 5, ()),
+                         self.cache.make_key('power', 59.8, 1000, 5, ()))
+        balanced = worker.balance_signal(capture(59.8), sample_rate=1000)
+
+        fresh = EnhancedHarmonicBalancer(worker.base_frequency, num_harmonics=5, application='power')
+        np.testing.assert_array_equal(worker.design_filter(1000), fresh.design_filter(1000))
+        self.assertLess(worker.calculate_thd(balanced, 1000), 0.02)
+
+    def test_warm_hit_does_not_rewrite(self):
+        EnhancedHarmonicBalancer(60, num_harmonics=5, application='power',
+                                 calibration_cache=self.cache).balance_signal(self.signal, sample_rate=1000)
+        worker = EnhancedHarmonicBalancer(60, num_harmonics=5, application='power', calibration_cache=self.cache)
+        with mock.patch.object(self.cache, 'store', wraps=self.cache.store) as store:
+            worker.balance_signal(self.signal, sample_rate=1000)
+            store.assert_not_called()
+
+            # A calibration that no longer fits is refreshed
+            self.cache.update_tolerance = -1
+            worker.balance_signal(self.signal, sample_rate=1000)
+            store.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
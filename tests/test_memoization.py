@@ -0,0 +1,123 @@
+import io
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+import numpy as np
+from src.memoization import BalanceMemo
+from src.harmonic_balancer import EnhancedHarmonicBalancer
+
+class TestBalanceMemo(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.INFO)
+        t = np.arange(1000) / 1000
+        self.signal = np.sin(2 * np.pi * 60 * t) + 0.5 * np.sin(2 * np.pi * 120 * t)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_key_depends_on_content_and_params(self):
+        key = BalanceMemo.make_key(self.signal, sample_rate=1000.0, psi=np.zeros(5))
+        self.assertEqual(key, BalanceMemo.make_key(self.signal.copy(), sample_rate=1000.0, psi=np.zeros(5)))
+        self.assertNotEqual(key, BalanceMemo.make_key(self.signal, sample_rate=2000.0, psi=np.zeros(5)))
+        self.assertNotEqual(key, BalanceMemo.make_key(self.signal, sample_rate=1000.0, psi=np.ones(5)))
+        self.assertNotEqual(key, BalanceMemo.make_key(self.signal.astype(np.float32), sample_rate=1000.0, psi=np.zeros(5)))
+
+    def test_lru_bounds(self):
+        memo = BalanceMemo(max_entries=2, max_bytes=100)
+        memo.put('a', {'x': np.zeros(4)})
+        memo.put('b', {'x': np.zeros(4)})
+        memo.get('a')
+        memo.put('c', {'x': np.zeros(4)})
+        self.assertIsNone(memo.get('b'))
+        self.assertIsNotNone(memo.get('a'))
+
+        # Byte budget evicts the least recently used entry too
+        memo.put('d', {'x': np.zeros(10)})
+        self.assertLessEqual(memo.stats()['bytes'], 100)
+        self.assertEqual(memo.stats()['entries'], 1)
+
+    def test_ttl_expiry(self):
+        memo = BalanceMemo(ttl=0.05)
+        memo.put('a', {'x': np.zeros(4)})
+        self.assertIsNotNone(memo.get('a'))
+        time.sleep(0.1)
+        self.assertIsNone(memo.get('a'))
+
+    def test_stats(self):
+        memo = BalanceMemo()
+        memo.put('a', {'x': np.zeros(4)})
+        memo.get('a')
+        memo.get('b')
+        stats = memo.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertAlmostEqual(stats['hit_rate'], 0.5)
+
+    def test_sqlite_backend_shares_results(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'memo.sqlite')
+            BalanceMemo(path=path).put('a', {'x': np.arange(4.0)})
+            other = BalanceMemo(path=path)
+            np.testing.assert_array_equal(other.get('a')['x'], np.arange(4.0))
+            self.assertEqual(other.stats()['hits'], 1)
+
+    def test_sqlite_backend_respects_byte_budget(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'memo.sqlite')
+            memo = BalanceMemo(max_bytes=4096, path=path)
+            # Larger than the whole budget: neither kept in process nor persisted
+            memo.put('big', {'x': np.zeros(1024)})
+            self.assertIsNone(BalanceMemo(path=path).get('big'))
+
+            for key in 'abcdef':
+                memo.put(key, {'x': np.zeros(128)})
+            total = memo.connection.execute("SELECT SUM(size) FROM memo").fetchone()[0]
+            self.assertLessEqual(total, 4096)
+            other = BalanceMemo(path=path)
+            self.assertIsNotNone(other.get('f'))
+            self.assertIsNone(other.get('a'))
+
+    def test_sqlite_backend_upgrades_old_schema(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'memo.sqlite')
+            buffer = io.BytesIO()
+            np.savez(buffer, x=np.arange(4.0))
+            connection = sqlite3.connect(path)
+            with connection:
+                connection.execute("CREATE TABLE memo (key TEXT PRIMARY KEY, created REAL, accessed REAL, value BLOB)")
+                connection.execute("INSERT INTO memo VALUES ('a', ?, ?, ?)", (time.time(), time.time(), buffer.getvalue()))
+            connection.close()
+            other = BalanceMemo(path=path)
+            size = other.connection.execute("SELECT size FROM memo WHERE key = 'a'").fetchone()[0]
+            self.assertGreater(size, 0)
+            np.testing.assert_array_equal(other.get('a')['x'], np.arange(4.0))
+
+    def test_seeded_balancers_share_results(self):
+        memo = BalanceMemo()
+        first = EnhancedHarmonicBalancer(60, num_harmonics=5, application='power', seed=7, memo=memo)
+        expected = first.balance_signal(self.signal, sample_rate=1000)
+
+        second = EnhancedHarmonicBalancer(60, num_harmonics=5, application='power', seed=7, memo=memo)
+        out = np.empty_like(self.signal)
+        result = second.balance_signal(self.signal, sample_rate=1000, out=out)
+        self.assertIs(result, out)
+        np.testing.assert_array_equal(out, expected)
+        np.testing.assert_array_equal(second.psi, first.psi)
+        self.assertEqual(memo.stats()['hits'], 1)
+
+        # Mutating a returned result must not corrupt the memo
+        expected[:] = 0
+        third = EnhancedHarmonicBalancer(60, num_harmonics=5, application='power', seed=7, memo=memo)
+        np.testing.assert_array_equal(third.balance_signal(self.signal, sample_rate=1000), out)
+
+    def test_different_initial_psi_misses(self):
+        memo = BalanceMemo()
+        EnhancedHarmonicBalancer(60, num_harmonics=5, application='power', seed=1, memo=memo).balance_signal(self.signal, 1000)
+        EnhancedHarmonicBalancer(60, num_harmonics=5, application='power', seed=2, memo=memo).balance_signal(self.signal, 1000)
+        self.assertEqual(memo.stats()['hits'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
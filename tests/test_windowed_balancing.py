@@ -0,0 +1,116 @@
+import logging
+import tracemalloc
+import unittest
+from unittest import mock
+import numpy as np
+from scipy.fft import rfft
+from src.harmonic_balancer import EnhancedHarmonicBalancer
+
+class TestWindowedBalancing(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.INFO)
+        self.sample_rate = 1000
+        self.duration = 30
+        t = np.arange(self.duration * self.sample_rate) / self.sample_rate
+        # Fundamental drifts between 58 and 62 Hz over the recording
+        self.drift = lambda times: 60 + 2 * np.sin(2 * np.pi * times / self.duration)
+        phase = 2 * np.pi * np.cumsum(self.drift(t)) / self.sample_rate
+        self.signal = np.sin(phase) + 0.3 * np.sin(3 * phase) + 0.1 * np.sin(5 * phase)
+        self.balancer = EnhancedHarmonicBalancer(base_frequency=60, num_harmonics=5, application='power')
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_tracks_drifting_frequency(self):
+        balanced = self.balancer.balance_signal_windowed(self.signal, self.sample_rate)
+        self.assertEqual(len(balanced), len(self.signal))
+        self.assertFalse(np.any(np.isnan(balanced)))
+
+        analysis = self.balancer.frame_analysis
+        interior = slice(1, -1)
+        expected = self.drift(analysis['times'][interior])
+        np.testing.assert_allclose(analysis['frequencies'][interior], expected, atol=0.1)
+        self.assertEqual(analysis['psi'].shape, (len(analysis['times']), 5))
+        self.assertEqual(analysis['harmonics'].shape, (len(analysis['times']), 5))
+        # Third harmonic is 30% of the fundamental throughout
+        np.testing.assert_allclose(analysis['harmonics'][interior, 2] / analysis['harmonics'][interior, 0], 0.3, atol=0.05)
+
+    def test_thd_improves_in_every_second(self):
+        balanced = self.balancer.balance_signal_windowed(self.signal, self.sample_rate)
+        for start in range(0, len(self.signal), self.sample_rate):
+            segment = slice(start, start + self.sample_rate)
+            self.assertLess(self.balancer.calculate_thd(balanced[segment], self.sample_rate),
+                            self.balancer.calculate_thd(self.signal[segment], self.sample_rate))
+
+    def test_fewer_ffts_than_per_slice_balancing(self):
+        # Count transformed samples instead of timing, so the check is deterministic
+        signal = self.signal[:10 * self.sample_rate]
+
+        def transformed_samples(run):
+            with mock.patch('src.harmonic_balancer.rfft', wraps=rfft) as fft:
+                run(EnhancedHarmonicBalancer(base_frequency=60, num_harmonics=5, application='power', seed=0))
+            return sum(np.size(call.args[0]) for call in fft.call_args_list)
+
+        def windowed(balancer):
+            balancer.balance_signal_windowed(signal, self.sample_rate)
+
+        def per_slice(balancer):
+            for start in range(0, len(signal) - 1000 + 1, 500):
+                balancer.balance_signal(signal[start:start + 1000], self.sample_rate)
+
+        # Per-slice balancing transforms every trial signal; windowed mode only
+        # transforms the frames and harmonic bases once per block
+        self.assertLess(5 * transformed_samples(windowed), transformed_samples(per_slice))
+
+    def test_float32_optimizes_psi(self):
+        balancer = EnhancedHarmonicBalancer(60, num_harmonics=5, application='power', dtype=np.float32, seed=1)
+        initial_psi = balancer.psi.copy()
+        balanced = balancer.balance_signal_windowed(self.signal[:10 * self.sample_rate].astype(np.float32),
+                                                    self.sample_rate)
+        self.assertEqual(balanced.dtype, np.float32)
+        self.assertGreater(np.max(np.abs(balancer.frame_analysis['psi'] - initial_psi)), 0.1)
+
+    def test_block_memory_follows_budget(self):
+        signal = self.signal[:10 * self.sample_rate]
+        budget = 2**18
+        tracemalloc.start()
+        try:
+            self.balancer.balance_signal_windowed(signal, self.sample_rate, memory_budget=budget)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        # Full-length frame buffers scale with the input, Psi blocks with the budget
+        self.assertLess(peak, 8 * signal.nbytes + budget)
+
+    def test_block_size_does_not_change_result(self):
+        signal = self.signal[:10 * self.sample_rate]
+        results = []
+        for block_size in (1, 64):
+            balancer = EnhancedHarmonicBalancer(base_frequency=60, num_harmonics=5, application='power', seed=0)
+            results.append(balancer.balance_signal_windowed(signal, self.sample_rate, block_size=block_size))
+        np.testing.assert_allclose(results[0], results[1], rtol=1e-10, atol=1e-12)
+
+    def test_short_signal_falls_back(self):
+        balanced = self.balancer.balance_signal_windowed(self.signal[:500], self.sample_rate)
+        self.assertEqual(len(balanced), 500)
+
+    def test_odd_sample_rate_defaults(self):
+        sample_rate = 11025
+        t = np.arange(3 * sample_rate) / sample_rate
+        signal = np.sin(2 * np.pi * 60 * t) + 0.3 * np.sin(2 * np.pi * 180 * t)
+        balanced = self.balancer.balance_signal_windowed(signal, sample_rate)
+        self.assertEqual(len(balanced), len(signal))
+        self.assertFalse(np.any(np.isnan(balanced)))
+        analysis = self.balancer.frame_analysis
+        inside = (analysis['times'] >= 0.5) & (analysis['times'] <= 2.5)
+        np.testing.assert_allclose(analysis['frequencies'][inside], 60, atol=0.1)
+
+    def test_invalid_hop_length(self):
+        with self.assertRaises(ValueError):
+            self.balancer.balance_signal_windowed(self.signal, self.sample_rate, frame_length=1000, hop_length=300)
+        with self.assertRaises(ValueError):
+            self.balancer.balance_signal_windowed(self.signal, self.sample_rate, frame_length=1000, hop_length=1000)
+
+if __name__ == '__main__':
+    unittest.main()
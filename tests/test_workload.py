@@ -0,0 +1,119 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import numpy as np
+from src.workload import generate_workload, library_tasks, http_tasks, replay, NOISE_BLOCK
+
+class StubBalanceHandler(BaseHTTPRequestHandler):
+    received = []
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.received.append(payload)
+        body = json.dumps({'metrics': {'improvement': '50.00%'}}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class TestWorkload(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.INFO)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_reproducible_and_chunk_independent(self):
+        a = generate_workload('power', num_channels=3, duration=40, seed=3, chunk_size=NOISE_BLOCK)
+        b = generate_workload('power', num_channels=3, duration=40, seed=3, chunk_size=4 * NOISE_BLOCK)
+        self.assertEqual(a.shape, (3, 40000))
+        np.testing.assert_array_equal(a, b)
+        self.assertFalse(np.array_equal(a, generate_workload('power', num_channels=3, duration=40, seed=4)))
+
+    def test_memmap_output(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'capture.npy')
+            data = generate_workload('vibration', num_channels=2, duration=5, dtype=np.float32, path=path)
+            expected = generate_workload('vibration', num_channels=2, duration=5, dtype=np.float32)
+            loaded = np.load(path, mmap_mode='r')
+            self.assertEqual(loaded.dtype, np.float32)
+            np.testing.assert_array_equal(loaded, expected)
+            del data, loaded
+
+    def test_frequency_drifts(self):
+        data = generate_workload('power', num_channels=1, duration=30, drift=2.0, drift_period=30, noise=0)
+        peaks = []
+        for start in range(0, data.shape[1], 5000):
+            spectrum = np.abs(np.fft.rfft(data[0, start:start + 5000]))
+            peaks.append(np.argmax(spectrum) * 1000 / 5000)
+        self.assertGreater(max(peaks) - min(peaks), 1.0)
+        self.assertTrue(all(57.5 <= peak <= 62.5 for peak in peaks))
+
+    def test_library_replay_report(self):
+        data = generate_workload('power', num_channels=2, duration=3)
+        report = replay(library_tasks(data, 1000, 1000, seed=0), concurrency=2)
+        self.assertEqual(report['requests'], 6)
+        self.assertEqual(report['errors'], 0)
+        self.assertGreater(report['throughput'], 0)
+        self.assertLessEqual(report['latency']['p50'], report['latency']['p99'])
+        self.assertIsNone(report['peak_traced_memory'])
+        self.assertGreater(report['thd_improvement']['mean'], 0)
+        if report['process_max_rss_bytes'] is not None:
+            # A process with numpy and scipy loaded holds tens of megabytes, not kilobytes
+            self.assertGreater(report['process_max_rss_bytes'], 10 * 2**20)
+            self.assertGreaterEqual(report['max_rss_growth_bytes'], 0)
+
+    def test_traced_memory_pass(self):
+        data = generate_workload('power', num_channels=1, duration=2)
+        report = replay(library_tasks(data, 1000, 1000, seed=0), trace_memory=True)
+        self.assertGreater(report['peak_traced_memory'], 0)
+
+    def test_rate_limits_throughput(self):
+        tasks = [lambda: 0.5] * 5
+        report = replay(tasks, rate=20)
+        self.assertGreaterEqual(report['duration'], 4 / 20)
+        self.assertIsNone(report['peak_traced_memory'])
+        self.assertEqual(report['thd_improvement']['p50'], 0.5)
+
+    def test_errors_are_counted(self):
+        def failing():
+            raise RuntimeError("boom")
+        def invalid():
+            raise ValueError("bad segment")
+        report = replay([failing, lambda: 0.1, invalid, failing])
+        self.assertEqual((report['requests'], report['errors']), (4, 3))
+        self.assertEqual(report['error_types'], {'RuntimeError': 2, 'ValueError': 1})
+        self.assertEqual(report['first_error'], "RuntimeError('boom')")
+        self.assertEqual(report['thd_improvement']['mean'], 0.1)
+
+    def test_http_replay(self):
+        StubBalanceHandler.received = []
+        server = HTTPServer(('127.0.0.1', 0), StubBalanceHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            data = generate_workload('power', num_channels=2, duration=2)
+            url = f'http://127.0.0.1:{server.server_port}/api/balance'
+            report = replay(http_tasks(url, data, 1000, 1000), concurrency=2)
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.assertEqual((report['requests'], report['errors']), (4, 0))
+        self.assertAlmostEqual(report['thd_improvement']['mean'], 0.5)
+        for payload in StubBalanceHandler.received:
+            self.assertAlmostEqual(payload['baseFreq'], 60, delta=1)
+            self.assertIsInstance(payload['harmonicLevel'], int)
+            # The power profile has only odd harmonics; the level must still reflect them
+            self.assertGreaterEqual(payload['harmonicLevel'], 10)
+
+if __name__ == '__main__':
+    unittest.main()